@@ -2,11 +2,20 @@
 """Check for differences between the latest and previous snapshots."""
 
 import os
+import re
 import sys
+import difflib
+import hashlib
 import subprocess
 from pathlib import Path
 from typing import Optional
 
+# Diff size limit for GitHub Issues (65KB)
+MAX_DIFF_CHARS = 65000
+
+# Added/removed lines, excluding the +++/--- file headers
+_CHANGED_LINE_RE = re.compile(r'^(?:\+(?!\+\+)|-(?!--))', re.MULTILINE)
+
 
 def get_snapshots() -> list[str]:
     """Get sorted list of snapshot files.
@@ -22,6 +31,36 @@ def get_snapshots() -> list[str]:
     return snapshots
 
 
+def file_digest(path: str) -> bytes:
+    """Compute a BLAKE2b digest of a file's contents.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        16-byte digest
+    """
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).digest()
+
+
+def snapshots_identical(prev_file: str, latest_file: str) -> bool:
+    """Check whether two snapshots are byte-identical without diffing them.
+
+    Args:
+        prev_file: Path to previous snapshot
+        latest_file: Path to latest snapshot
+
+    Returns:
+        True if both files have the same contents
+    """
+    try:
+        if Path(prev_file).stat().st_size != Path(latest_file).stat().st_size:
+            return False
+        return file_digest(prev_file) == file_digest(latest_file)
+    except OSError:
+        return False
+
+
 def calculate_diff(prev_file: str, latest_file: str) -> Optional[str]:
     """Calculate diff between two files with extended context.
 
@@ -33,109 +72,134 @@ def calculate_diff(prev_file: str, latest_file: str) -> Optional[str]:
         Diff string if changes exist, None otherwise
     """
     try:
-        # Use unified=10 for more context (10 lines before/after changes)
-        result = subprocess.run(
-            ["git", "diff", "--no-index", "--unified=10", prev_file, latest_file],
-            capture_output=True,
-            text=True
-        )
-
-        # git diff returns exit code 1 when files differ
-        if result.returncode == 1 and result.stdout:
-            return result.stdout
-        elif result.returncode > 1:
-            print(f"❌ Error running git diff: {result.stderr}", file=sys.stderr)
-            return None
-
-        return None  # No changes
+        # Split on '\n' only, like git, so hunk line numbers match the
+        # line numbers the summary parser uses for section lookup
+        with open(prev_file, 'r', encoding='utf-8', newline='\n') as f:
+            prev_lines = f.readlines()
+        with open(latest_file, 'r', encoding='utf-8', newline='\n') as f:
+            latest_lines = f.readlines()
+
+        # Use n=10 for more context (10 lines before/after changes)
+        diff_parts = []
+        for line in difflib.unified_diff(
+            prev_lines,
+            latest_lines,
+            fromfile=prev_file,
+            tofile=latest_file,
+            n=10
+        ):
+            diff_parts.append(line)
+            # Keep a missing final newline from gluing lines together
+            if not line.endswith('\n'):
+                diff_parts.append('\n\\ No newline at end of file\n')
+
+        if not diff_parts:
+            return None  # No changes
+
+        return ''.join(diff_parts)
 
     except Exception as e:
         print(f"❌ Error calculating diff: {e}", file=sys.stderr)
         return None
 
 
-def summarize_diff(diff_output: str) -> str:
+def summarize_diff(diff_output: str, truncated: bool = False) -> str:
     """Create a human-readable summary of changes.
 
     Args:
         diff_output: Raw diff output
+        truncated: Whether diff_output was cut at MAX_DIFF_CHARS
 
     Returns:
         Summary string
     """
-    lines = diff_output.split('\n')
-    additions = sum(1 for line in lines if line.startswith('+') and not line.startswith('+++'))
-    deletions = sum(1 for line in lines if line.startswith('-') and not line.startswith('---'))
+    markers = _CHANGED_LINE_RE.findall(diff_output)
+    additions = markers.count('+')
+    deletions = len(markers) - additions
 
     summary = f"📊 **変更サマリー**\n\n"
     summary += f"- 追加行: {additions}行\n"
     summary += f"- 削除行: {deletions}行\n"
     summary += f"- 合計変更: {additions + deletions}行\n"
+    if truncated:
+        summary += f"\n※ 差分が長すぎるため、先頭{MAX_DIFF_CHARS}文字のみ集計しています\n"
 
     return summary
 
 
-def main():
-    """Main function to check for document changes."""
-    snapshots = get_snapshots()
-
-    if len(snapshots) < 2:
-        print("ℹ️  Not enough snapshots to compare (need at least 2)")
-        # Set output for GitHub Actions
-        with open(os.environ.get('GITHUB_OUTPUT', '/dev/null'), 'a') as f:
-            f.write("changed=false\n")
-        sys.exit(0)
+def compare_snapshots(prev_snapshot: str, latest_snapshot: str) -> bool:
+    """Diff two snapshots and write the summary/detail files if they differ.
 
-    # Compare latest with previous
-    prev_snapshot = f"snapshots/{snapshots[-2]}"
-    latest_snapshot = f"snapshots/{snapshots[-1]}"
+    Args:
+        prev_snapshot: Path to previous snapshot
+        latest_snapshot: Path to latest snapshot
 
+    Returns:
+        True if changes were detected, False otherwise
+    """
     print(f"📝 Comparing:")
-    print(f"  Previous: {snapshots[-2]}")
-    print(f"  Latest:   {snapshots[-1]}")
+    print(f"  Previous: {Path(prev_snapshot).name}")
+    print(f"  Latest:   {Path(latest_snapshot).name}")
+
+    # Unchanged pages produce identical snapshots; skip the diff entirely
+    if snapshots_identical(prev_snapshot, latest_snapshot):
+        print("✅ No changes detected")
+        return False
 
     diff_output = calculate_diff(prev_snapshot, latest_snapshot)
 
-    if diff_output:
-        print("🚨 Changes detected!")
-
-        # Create summary
-        summary = summarize_diff(diff_output)
-        with open("diff_summary.txt", "w", encoding="utf-8") as f:
-            f.write(summary)
-
-        # Save full diff (limit to 65KB for GitHub Issues)
-        diff_truncated = diff_output[:65000]
-        if len(diff_output) > 65000:
-            diff_truncated += "\n\n... (差分が長すぎるため省略されました)"
-
-        with open("diff_details.txt", "w", encoding="utf-8") as f:
-            f.write(diff_truncated)
-
-        # Generate semantic diff summary using parse_diff_summary.py
-        print("🔍 Generating semantic diff summary...")
-        try:
-            subprocess.run(
-                ["python", "scripts/parse_diff_summary.py", "diff_details.txt", latest_snapshot],
-                check=True
-            )
-            print("✅ Semantic diff summary generated")
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️  Warning: Could not generate semantic summary: {e}")
-
-        # Set output for GitHub Actions
-        with open(os.environ.get('GITHUB_OUTPUT', '/dev/null'), 'a') as f:
-            f.write("changed=true\n")
-
-        sys.exit(0)
-    else:
+    if not diff_output:
         print("✅ No changes detected")
+        return False
+
+    print("🚨 Changes detected!")
+
+    # Truncate first so the summary only walks what is actually saved
+    truncated = len(diff_output) > MAX_DIFF_CHARS
+    diff_truncated = diff_output[:MAX_DIFF_CHARS]
+
+    # Create summary
+    summary = summarize_diff(diff_truncated, truncated)
+    with open("diff_summary.txt", "w", encoding="utf-8") as f:
+        f.write(summary)
+
+    # Save diff (limited to MAX_DIFF_CHARS for GitHub Issues)
+    if truncated:
+        diff_truncated += "\n\n... (差分が長すぎるため省略されました)"
+
+    with open("diff_details.txt", "w", encoding="utf-8") as f:
+        f.write(diff_truncated)
+
+    # Generate semantic diff summary using parse_diff_summary.py
+    print("🔍 Generating semantic diff summary...")
+    try:
+        subprocess.run(
+            ["python", "scripts/parse_diff_summary.py", "diff_details.txt", latest_snapshot],
+            check=True
+        )
+        print("✅ Semantic diff summary generated")
+    except subprocess.CalledProcessError as e:
+        print(f"⚠️  Warning: Could not generate semantic summary: {e}")
+
+    return True
+
+
+def main():
+    """Main function to check for document changes."""
+    snapshots = get_snapshots()
+
+    if len(snapshots) < 2:
+        print("ℹ️  Not enough snapshots to compare (need at least 2)")
+        changed = False
+    else:
+        # Compare latest with previous
+        changed = compare_snapshots(f"snapshots/{snapshots[-2]}", f"snapshots/{snapshots[-1]}")
 
-        # Set output for GitHub Actions
-        with open(os.environ.get('GITHUB_OUTPUT', '/dev/null'), 'a') as f:
-            f.write("changed=false\n")
+    # Set output for GitHub Actions
+    with Path(os.environ.get('GITHUB_OUTPUT', '/dev/null')).open('a') as f:
+        f.write(f"changed={'true' if changed else 'false'}\n")
 
-        sys.exit(0)
+    sys.exit(0)
 
 
 if __name__ == "__main__":
@@ -4,24 +4,87 @@
 import sys
 import re
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Tag
+from bs4.element import NavigableString, PreformattedString
+
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+REQUEST_TIMEOUT = 30
+MAX_WORKERS = 16
+
+# Block-level tags that start a new line in the saved snapshot. Heading
+# text is also moved to its own line so the section lookup in
+# parse_diff_summary.py can read it from the line after the <hN id=...> tag.
+# Leading whitespace is only taken from the start of a run ((?<!\s)), so a
+# long run that is not followed by a tag is scanned once, not once per
+# position. A tag right after an earlier match's trailing whitespace still
+# matches through the optional group being skipped.
+BLOCK_TAG_PATTERN = re.compile(
+    r'(?:(?<!\s)\s*)?(?:(<h[1-6](?=[\s>])[^>]*>)\s*'
+    r'|(</?(?:html|head|body|header|footer|main|nav|section|article|aside'
+    r'|div|p|ul|ol|li|dl|dt|dd|table|thead|tbody|tfoot|tr|th|td|h[1-6]'
+    r'|pre|blockquote|form|title|style|meta|link)(?=[\s/>])[^>]*>))'
+)
+
+# Tags whose text is kept verbatim when normalizing whitespace
+PRESERVE_WHITESPACE_TAGS = ('pre', 'textarea')
+
+# Attributes whose values change on every fetch (nonces, CSRF tokens, ...)
+DYNAMIC_ATTR_PATTERN = re.compile(r'nonce|timestamp|csrf|cache[-_]?bust|session', re.IGNORECASE)
+
+# Shared session so every request to the same host reuses a pooled connection
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_maxsize=32))
+SESSION.mount('http://', HTTPAdapter(pool_maxsize=32))
+
+
+def format_for_diff(soup: BeautifulSoup) -> str:
+    """Serialize HTML with one block element per line for line-based diffs.
 
+    Args:
+        soup: BeautifulSoup object
+
+    Returns:
+        Serialized HTML
+    """
+    # Strip text nodes the way prettify() did, so the layout does not depend
+    # on source whitespace and prettified snapshots can be converted to it
+    for string in soup.find_all(string=True):
+        if isinstance(string, PreformattedString) or string.find_parent(PRESERVE_WHITESPACE_TAGS):
+            continue
+        stripped = string.strip()
+        if not stripped:
+            string.extract()
+        elif stripped != string:
+            string.replace_with(NavigableString(stripped))
 
-def fetch_resource(url: str, headers: dict, timeout: int = 30) -> bytes:
+    html_content = soup.decode(formatter='minimal')
+
+    def break_line(match: re.Match) -> str:
+        if match.group(1):
+            return f"\n{match.group(1)}\n"
+        return f"\n{match.group(2)}"
+
+    return BLOCK_TAG_PATTERN.sub(break_line, html_content).lstrip('\n') + '\n'
+
+
+def fetch_resource(url: str) -> bytes:
     """Fetch a resource and return its content as bytes.
 
     Args:
         url: URL to fetch
-        headers: HTTP headers
-        timeout: Request timeout
 
     Returns:
         Resource content as bytes
     """
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = SESSION.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.content
     except Exception as e:
@@ -29,23 +92,46 @@ def fetch_resource(url: str, headers: dict, timeout: int = 30) -> bytes:
         return b""
 
 
-def inline_css(soup: BeautifulSoup, base_url: str, headers: dict) -> None:
+def fetch_resources(urls: list[str]) -> dict[str, bytes]:
+    """Fetch several resources concurrently.
+
+    Args:
+        urls: URLs to fetch (duplicates are fetched once)
+
+    Returns:
+        Mapping of URL to resource content as bytes
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return dict(zip(unique_urls, executor.map(fetch_resource, unique_urls)))
+
+
+def inline_css(soup: BeautifulSoup, base_url: str, stylesheets: list[Tag]) -> None:
     """Inline external CSS stylesheets.
 
     Args:
         soup: BeautifulSoup object
         base_url: Base URL for resolving relative URLs
-        headers: HTTP headers
+        stylesheets: <link rel="stylesheet"> tags collected from the soup
     """
-    for link in soup.find_all('link', rel='stylesheet'):
+    links = []
+    for link in stylesheets:
         href = link.get('href')
         if not href:
             continue
 
         css_url = urljoin(base_url, href)
         print(f"📥 Fetching CSS: {css_url}")
+        links.append((link, css_url))
+
+    contents = fetch_resources([css_url for _, css_url in links])
 
-        css_content = fetch_resource(css_url, headers)
+    # Mutate the tree only after all fetches have finished
+    for link, css_url in links:
+        css_content = contents[css_url]
         if css_content:
             # Create inline style tag
             style_tag = soup.new_tag('style')
@@ -53,23 +139,28 @@ def inline_css(soup: BeautifulSoup, base_url: str, headers: dict) -> None:
             link.replace_with(style_tag)
 
 
-def inline_images(soup: BeautifulSoup, base_url: str, headers: dict) -> None:
+def inline_images(soup: BeautifulSoup, base_url: str, img_tags: list[Tag]) -> None:
     """Convert external images to base64 data URIs.
 
     Args:
         soup: BeautifulSoup object
         base_url: Base URL for resolving relative URLs
-        headers: HTTP headers
+        img_tags: <img> tags collected from the soup
     """
-    for img in soup.find_all('img'):
+    images = []
+    for img in img_tags:
         src = img.get('src')
         if not src or src.startswith('data:'):
             continue
 
         img_url = urljoin(base_url, src)
         print(f"🖼️  Fetching image: {img_url}")
+        images.append((img, img_url))
+
+    contents = fetch_resources([img_url for _, img_url in images])
 
-        img_content = fetch_resource(img_url, headers)
+    for img, img_url in images:
+        img_content = contents[img_url]
         if img_content:
             # Determine MIME type from extension
             ext = urlparse(img_url).path.split('.')[-1].lower()
@@ -88,6 +179,79 @@ def inline_images(soup: BeautifulSoup, base_url: str, headers: dict) -> None:
             img['src'] = f"data:{mime_type};base64,{b64_data}"
 
 
+def clean_document(soup: BeautifulSoup) -> tuple[list[Tag], list[Tag]]:
+    """Remove per-fetch noise from a parsed document.
+
+    Args:
+        soup: BeautifulSoup object
+
+    Returns:
+        Tuple of (stylesheet <link> tags, <img> tags) left for inlining
+    """
+    # Collect every tag we care about in a single tree traversal,
+    # scrubbing per-fetch attributes along the way
+    stylesheets = []
+    images = []
+    dynamic_tags = []
+    metadata_tags = []
+    headerlinks = []
+    for tag in soup.find_all(True):
+        for attr in [a for a in tag.attrs if DYNAMIC_ATTR_PATTERN.search(a)]:
+            del tag[attr]
+
+        if tag.name == 'link':
+            if 'stylesheet' in (tag.get('rel') or []):
+                stylesheets.append(tag)
+        elif tag.name == 'img':
+            images.append(tag)
+        elif tag.name == 'meta':
+            # Common timestamp/session metadata
+            if tag.get('name') in ['generator', 'date', 'timestamp', 'csrf-token', 'csrf-param']:
+                metadata_tags.append(tag)
+        elif tag.name == 'a':
+            # mkdocs permalink anchors ("¶") would end up on the heading
+            # text line that the section lookup reads
+            if 'headerlink' in (tag.get('class') or []):
+                headerlinks.append(tag)
+        elif tag.name in ('script', 'noscript'):
+            dynamic_tags.append(tag)
+
+    for anchor in headerlinks:
+        anchor.decompose()
+
+    # Remove metadata before scripts/noscripts, which may contain it
+    for meta in metadata_tags:
+        meta.decompose()
+
+    # Remove dynamic content that changes frequently
+    for tag in dynamic_tags:
+        if not tag.decomposed:
+            tag.decompose()
+
+    return stylesheets, images
+
+
+def reformat_snapshot(snapshot_path: str) -> None:
+    """Rewrite a saved snapshot in the current format_for_diff layout.
+
+    Used to re-baseline snapshots saved by an older serializer, so the next
+    fetch is not reported as a change. Resources are not re-fetched.
+
+    Args:
+        snapshot_path: Path to the snapshot HTML file
+    """
+    with open(snapshot_path, 'rb') as f:
+        soup = BeautifulSoup(f.read(), 'lxml')
+
+    clean_document(soup)
+    html_content = format_for_diff(soup)
+
+    with open(snapshot_path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+    print(f"✅ Reformatted {snapshot_path}")
+
+
 def fetch_document(url: str, output_path: str) -> None:
     """Fetch HTML document with all resources inlined.
 
@@ -95,35 +259,25 @@ def fetch_document(url: str, output_path: str) -> None:
         url: URL to fetch
         output_path: Path to save the HTML file
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-
     try:
         print(f"🌐 Fetching: {url}")
-        response = requests.get(url, headers=headers, timeout=30)
+        response = SESSION.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
         # Parse HTML
-        soup = BeautifulSoup(response.content, 'html5lib')
+        soup = BeautifulSoup(response.content, 'lxml')
+
+        # Drop tokens, scripts and permalink anchors that differ per fetch
+        stylesheets, images = clean_document(soup)
 
         # Inline external CSS
-        inline_css(soup, url, headers)
+        inline_css(soup, url, stylesheets)
 
         # Inline images (optional, can make file very large)
-        # inline_images(soup, url, headers)
-
-        # Remove dynamic content that changes frequently
-        for tag in soup.find_all(['script', 'noscript']):
-            tag.decompose()
-
-        # Remove common timestamp/session metadata
-        for meta in soup.find_all('meta'):
-            if meta.get('name') in ['generator', 'date', 'timestamp']:
-                meta.decompose()
+        # inline_images(soup, url, images)
 
-        # Prettify for human-readable diffs
-        html_content = soup.prettify()
+        # One block element per line for human-readable diffs
+        html_content = format_for_diff(soup)
 
         # Save to file
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -143,6 +297,10 @@ def fetch_document(url: str, output_path: str) -> None:
 if __name__ == "__main__":
     if len(sys.argv) != 3:
         print("Usage: fetch_doc.py <url> <output_path>")
+        print("       fetch_doc.py --reformat <snapshot_path>")
         sys.exit(1)
 
-    fetch_document(sys.argv[1], sys.argv[2])
+    if sys.argv[1] == '--reformat':
+        reformat_snapshot(sys.argv[2])
+    else:
+        fetch_document(sys.argv[1], sys.argv[2])
@@ -2,12 +2,29 @@
 """Generate visual diff viewer pages for GitHub Pages."""
 
 import os
+import re
 import sys
 import json
 import shutil
 from pathlib import Path
 from typing import Dict, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Counts written to diff_summary.txt by check_diff.summarize_diff
+_ADDITIONS_RE = re.compile(r'追加行:\s*(\d+)')
+_DELETIONS_RE = re.compile(r'削除行:\s*(\d+)')
+
+
+def to_json(obj) -> str:
+    """Serialize an object to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
 
 def copy_snapshots_to_docs():
     """Copy latest snapshots to docs directory for GitHub Pages."""
@@ -24,7 +41,21 @@ def copy_snapshots_to_docs():
 
     for snapshot in snapshot_files:
         dest = docs_snapshots_dir / snapshot.name
-        shutil.copy2(snapshot, dest)
+
+        # Skip files already linked/copied (both preserve size and mtime)
+        src_stat = snapshot.stat()
+        if dest.exists():
+            dest_stat = dest.stat()
+            if (dest_stat.st_size, dest_stat.st_mtime_ns) == (src_stat.st_size, src_stat.st_mtime_ns):
+                continue
+
+        # Hard-link when possible (same filesystem); otherwise copy
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(snapshot, dest)
+        except OSError:
+            shutil.copy2(snapshot, dest)
         print(f"📄 Copied {snapshot.name}")
 
     return [f.stem for f in snapshot_files]
@@ -43,12 +74,14 @@ def read_diff_stats() -> Dict:
     if summary_path.exists():
         with open(summary_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            # Parse additions and deletions
-            for line in content.split('\n'):
-                if '追加行:' in line:
-                    stats["additions"] = int(''.join(filter(str.isdigit, line)))
-                elif '削除行:' in line:
-                    stats["deletions"] = int(''.join(filter(str.isdigit, line)))
+
+        # Parse additions and deletions
+        additions_match = _ADDITIONS_RE.search(content)
+        if additions_match:
+            stats["additions"] = int(additions_match.group(1))
+        deletions_match = _DELETIONS_RE.search(content)
+        if deletions_match:
+            stats["deletions"] = int(deletions_match.group(1))
 
     return stats
 
@@ -73,20 +106,13 @@ def update_changes_index(date: str, prev_date: str, stats: Dict):
         "summary": "ドキュメント更新"
     }
 
-    # Find the changesData array and prepend new entry
-    marker = "const changesData = ["
+    # Prepend the new entry right after the marker at the top of changesData
+    marker = "// __CHANGES_INSERT_MARKER__"
     if marker in content:
-        insert_pos = content.index(marker) + len(marker)
-
         # Format the new entry
         entry_json = json.dumps(new_change, ensure_ascii=False, indent=12)
 
-        # Insert at the beginning of the array
-        updated_content = (
-            content[:insert_pos] +
-            "\n" + entry_json + "," +
-            content[insert_pos:]
-        )
+        updated_content = content.replace(marker, f"{marker}\n{entry_json},", 1)
 
         with open(index_path, 'w', encoding='utf-8') as f:
             f.write(updated_content)
@@ -121,13 +147,16 @@ def generate_viewer_page(date: str, prev_date: str, stats: Dict):
     diff_summary = []
     summary_path = Path("diff_summary.json")
     if summary_path.exists():
-        with open(summary_path, 'r', encoding='utf-8') as f:
-            summary_data = json.load(f)
-            diff_summary = summary_data.get('changes', [])
+        if orjson is not None:
+            summary_data = orjson.loads(summary_path.read_bytes())
+        else:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                summary_data = json.load(f)
+        diff_summary = summary_data.get('changes', [])
 
     # Escape for JavaScript string
-    diff_details_escaped = json.dumps(diff_details)
-    diff_summary_escaped = json.dumps(diff_summary, ensure_ascii=False)
+    diff_details_escaped = to_json(diff_details)
+    diff_summary_escaped = to_json(diff_summary)
 
     # Update configuration in the viewer
     config_update = f"""
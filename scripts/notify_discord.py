@@ -6,6 +6,41 @@ import json
 import requests
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def split_into_chunks(text: str, chunk_size: int, max_chunks: int) -> list[str]:
+    """Pack whole lines into chunks of at most chunk_size characters.
+
+    Lines longer than chunk_size are split at the size limit.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum characters per chunk
+        max_chunks: Maximum number of chunks to return
+
+    Returns:
+        List of chunks (at most max_chunks)
+    """
+    chunks = []
+    buf = ""
+    for line in text.splitlines(keepends=True):
+        for i in range(0, len(line), chunk_size):
+            piece = line[i:i + chunk_size]
+            if len(buf) + len(piece) > chunk_size:
+                chunks.append(buf)
+                if len(chunks) == max_chunks:
+                    return chunks
+                buf = ""
+            buf += piece
+
+    if buf:
+        chunks.append(buf)
+    return chunks
+
 
 def send_discord_notification(webhook_url: str, date: str, repo_url: str) -> None:
     """Send change notification to Discord.
@@ -24,46 +59,48 @@ def send_discord_notification(webhook_url: str, date: str, repo_url: str) -> Non
     with open(summary_path, 'r', encoding='utf-8') as f:
         summary = f.read()
 
-    # Read diff and split into chunks for Discord embed
+    # Read diff and split into chunks for Discord embed fields
     diff_path = Path("diff_details.txt")
-    diff_chunks = []
+    diff_fields = []
     if diff_path.exists():
-        with open(diff_path, 'r', encoding='utf-8') as f:
-            diff_content = f.read()
+        # Discord embed field limit: 1024 chars
+        # Split into multiple fields if needed (max 3 chunks)
+        chunk_size = 950  # Leave room for code block markers
+        preview_limit = chunk_size * 3
 
-            # Discord embed field limit: 1024 chars
-            # Split into multiple fields if needed (max 3 chunks)
-            chunk_size = 950  # Leave room for code block markers
-            for i in range(0, min(len(diff_content), chunk_size * 3), chunk_size):
-                chunk = diff_content[i:i + chunk_size]
-                diff_chunks.append(chunk)
+        # Only read what the embed can show, plus one char to detect truncation
+        with open(diff_path, 'r', encoding='utf-8') as f:
+            diff_content = f.read(preview_limit + 1)
+
+        # Break on line boundaries so each ```diff block renders cleanly
+        diff_chunks = split_into_chunks(diff_content, chunk_size, 3)
+        diff_fields = [
+            {
+                "name": "🔍 差分プレビュー" if idx == 0 else f"🔍 差分プレビュー (続き {idx + 1})",
+                "value": "```diff\n" + chunk.rstrip('\n') + "\n```",
+                "inline": False
+            }
+            for idx, chunk in enumerate(diff_chunks)
+        ]
 
-            # Add truncation notice if content is very long
-            if len(diff_content) > chunk_size * 3:
-                diff_chunks.append(f"\n... (残り {len(diff_content) - chunk_size * 3} 文字)")
+        # Add truncation notice below the last chunk if content is very long
+        shown_bytes = sum(len(chunk.encode('utf-8')) for chunk in diff_chunks)
+        remaining = diff_path.stat().st_size - shown_bytes
+        if diff_fields and remaining > 0:
+            diff_fields[-1]["value"] += f"\n... (残り約 {remaining} バイト)"
 
     # Create Discord embed
     embed = {
         "title": f"🚨 NTT SCP仕様書が更新されました",
         "description": f"**日付**: {date}\n\n{summary}",
         "color": 15158332,  # Red color
-        "fields": [],
+        "fields": diff_fields,
         "timestamp": None,
         "footer": {
             "text": "NTT SCP Document Monitor"
         }
     }
 
-    # Add diff chunks as separate fields
-    if diff_chunks:
-        for idx, chunk in enumerate(diff_chunks[:3]):  # Max 3 chunks
-            field_name = f"🔍 差分プレビュー" if idx == 0 else f"🔍 差分プレビュー (続き {idx + 1})"
-            embed["fields"].append({
-                "name": field_name,
-                "value": f"```diff\n{chunk}\n```",
-                "inline": False
-            })
-
     # Extract username from repo_url
     username = repo_url.split('/')[-2] if '/' in repo_url else 'unknown'
     repo_name = repo_url.split('/')[-1] if '/' in repo_url else 'unknown'
@@ -94,10 +131,16 @@ def send_discord_notification(webhook_url: str, date: str, repo_url: str) -> Non
         "embeds": [embed]
     }
 
+    # orjson is considerably faster than stdlib json; fall back if not installed
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
     try:
         response = requests.post(
             webhook_url,
-            json=payload,
+            data=body,
             headers={"Content-Type": "application/json"},
             timeout=10
         )
@@ -2,6 +2,7 @@
 """Send notification via email using Gmail SMTP."""
 
 import sys
+import html
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -37,11 +38,14 @@ def send_email_notification(
     diff_path = Path("diff_details.txt")
     diff_content = ""
     if diff_path.exists():
+        # Limit to 5000 characters for email; read one extra to detect truncation
         with open(diff_path, 'r', encoding='utf-8') as f:
-            diff_content = f.read()
-            # Limit to 5000 characters for email
-            if len(diff_content) > 5000:
-                diff_content = diff_content[:5000] + f"\n\n... (残り {len(diff_content) - 5000} 文字)"
+            diff_content = f.read(5001)
+
+        if len(diff_content) > 5000:
+            diff_content = diff_content[:5000]
+            remaining = diff_path.stat().st_size - len(diff_content.encode('utf-8'))
+            diff_content += f"\n\n... (残り約 {remaining} バイト)"
 
     # Extract username from repo_url
     username = repo_url.split('/')[-2] if '/' in repo_url else 'unknown'
@@ -79,7 +83,9 @@ NTT SCP仕様書が更新されました
 NTT SCP Document Monitor
     """.strip()
 
-    # HTML version
+    # HTML version (diff and summary contain raw HTML markup, so escape them)
+    summary_html = html.escape(summary)
+    diff_html = html.escape(diff_content)
     html_body = f"""
 <!DOCTYPE html>
 <html>
@@ -165,12 +171,12 @@ NTT SCP Document Monitor
 
     <div class="summary">
         <strong>変更サマリー</strong><br>
-        <pre style="white-space: pre-wrap; font-family: inherit;">{summary}</pre>
+        <pre style="white-space: pre-wrap; font-family: inherit;">{summary_html}</pre>
     </div>
 
     <div class="diff">
         <strong>📝 差分詳細</strong>
-        <pre>{diff_content}</pre>
+        <pre>{diff_html}</pre>
     </div>
 
     <div class="links">
@@ -197,7 +203,11 @@ NTT SCP Document Monitor
     try:
         with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
             server.login(gmail_address, gmail_app_password)
-            server.sendmail(gmail_address, to_addresses.split(','), msg.as_string())
+            server.send_message(
+                msg,
+                from_addr=gmail_address,
+                to_addrs=[address.strip() for address in to_addresses.split(',')]
+            )
 
         print(f"✅ Email notification sent successfully to {to_addresses}")
     except smtplib.SMTPException as e:
@@ -6,12 +6,37 @@ individual logical units (table rows, list items, paragraphs, etc.)
 """
 
 import re
+import bisect
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass, asdict
-
-
-@dataclass
+from dataclasses import dataclass, fields
+
+
+_RE_OPEN_TAG = re.compile(r'<(tr|li|p|div|h[1-6])[\s>]')
+_RE_CLOSE_TAG = re.compile(r'</(tr|li|p|div|h[1-6])>')
+_RE_STRIP_TAGS = re.compile(r'<[^>]+>')
+_RE_STRIP_LINE_TAGS = re.compile(r'<[^>\n]+>')  # Never spans joined lines
+_RE_HEADING = re.compile(r'<h([2-4])[^>]*id=["\']([^"\']+)["\'][^>]*>')
+_RE_PURE_TAG = re.compile(r'^\s*</?[^>]+>\s*$')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_CHUNK_HDR = re.compile(r'^@@ -(\d+),?\d* \+(\d+),?\d* @@')
+_RE_TR_P_DIV = re.compile(r'<tr>|<p>|<div')
+
+# Element-type markers, resolved in _ELEMENT_PRIORITY order (link needs both
+# '<a' and 'href=')
+_RE_ELEMENT_MARKER = re.compile(
+    r'(?P<table_row><tr>|<td>)|(?P<list_item><li>)|(?P<heading><h[1-3])'
+    r'|(?P<paragraph><p[> ])|(?P<admonition><div class="admonition)'
+    r'|(?P<navigation>class="md-nav)|(?P<link_open><a)|(?P<link_href>href=)'
+)
+_ELEMENT_PRIORITY = ("table_row", "list_item", "heading", "paragraph", "admonition", "navigation")
+_RE_ADMONITION_KIND = re.compile(r'admonition (warning|note)')
+
+# Markup that marks a snapshot line as part of the navigation/sidebar
+_NAV_PATTERNS = ('class="md-nav', '<nav', 'md-sidebar', 'md-header')
+
+
+@dataclass(slots=True)
 class Change:
     """Represents a single semantic change."""
     section: str
@@ -25,31 +50,34 @@ class Change:
     html_element: str = ""  # e.g., "table_row", "list_item", "paragraph"
 
 
+# Field names in declaration order, for flat dict conversion without asdict()
+_CHANGE_FIELDS = tuple(f.name for f in fields(Change))
+
+
 class HTMLStructureDetector:
     """Detects HTML structural elements in diff lines."""
 
     @staticmethod
-    def detect_element_type(lines: List[str]) -> str:
-        """Detect the type of HTML element in the given lines."""
-        combined = ' '.join(lines).lower()
+    def detect_element_type(lines: List[str], joined: Optional[str] = None) -> str:
+        """Detect the type of HTML element in the given lines.
+
+        joined may be passed as ' '.join(lines) when the caller already has it.
+        """
+        if joined is None:
+            joined = ' '.join(lines)
+
+        # One scan of the lowered text collects every marker present. The
+        # text is lowered rather than matched with IGNORECASE, which would
+        # also fold non-ASCII letters like 'İ' onto 'i'.
+        found = {m.lastgroup for m in _RE_ELEMENT_MARKER.finditer(joined.lower())}
 
         # Priority order matters
-        if '<tr>' in combined or '<td>' in combined:
-            return "table_row"
-        elif '<li>' in combined:
-            return "list_item"
-        elif '<h1' in combined or '<h2' in combined or '<h3' in combined:
-            return "heading"
-        elif '<p>' in combined or '<p ' in combined:
-            return "paragraph"
-        elif '<div class="admonition' in combined:
-            return "admonition"
-        elif 'class="md-nav' in combined:
-            return "navigation"
-        elif '<a' in combined and 'href=' in combined:
+        for element_type in _ELEMENT_PRIORITY:
+            if element_type in found:
+                return element_type
+        if 'link_open' in found and 'link_href' in found:
             return "link"
-        else:
-            return "content"
+        return "content"
 
     @staticmethod
     def find_element_boundaries(lines: List[str]) -> List[Tuple[int, int]]:
@@ -67,8 +95,8 @@ class HTMLStructureDetector:
             stripped = line.strip()
 
             # Opening tags that define element boundaries
-            if re.search(r'<(tr|li|p|div|h[1-6])[\s>]', stripped):
-                tag_match = re.search(r'<(tr|li|p|div|h[1-6])[\s>]', stripped)
+            tag_match = _RE_OPEN_TAG.search(stripped)
+            if tag_match:
                 tag = tag_match.group(1)
 
                 if not current_start:
@@ -77,8 +105,8 @@ class HTMLStructureDetector:
                 stack.append(tag)
 
             # Closing tags
-            if re.search(r'</(tr|li|p|div|h[1-6])>', stripped):
-                tag_match = re.search(r'</(tr|li|p|div|h[1-6])>', stripped)
+            tag_match = _RE_CLOSE_TAG.search(stripped)
+            if tag_match:
                 tag = tag_match.group(1)
 
                 if stack and stack[-1] == tag:
@@ -106,39 +134,60 @@ class SemanticChangeDetector:
 
     def __init__(self, snapshot_path: Path):
         self.snapshot_path = snapshot_path
-        self.snapshot_lines = []
+        self.line_count = 0
+
+        # Line-number indexes built in one streaming pass over the snapshot,
+        # so the snapshot lines themselves are never held in memory:
+        # - h2-h4 headings with id whose next line holds the heading text
+        # - lines containing navigation markup
+        self._heading_lines: List[int] = []
+        self._heading_info: List[Tuple[str, str]] = []
+        self._nav_lines: List[int] = []
         if snapshot_path.exists():
             with open(snapshot_path, 'r', encoding='utf-8') as f:
-                self.snapshot_lines = f.readlines()
+                pending_anchor = None
+                for i, line in enumerate(f):
+                    if pending_anchor is not None:
+                        heading_text = _RE_STRIP_TAGS.sub('', line).strip()
+                        if heading_text:
+                            self._heading_lines.append(i - 1)
+                            self._heading_info.append((heading_text, pending_anchor))
+
+                    h_match = _RE_HEADING.search(line)
+                    pending_anchor = h_match.group(2) if h_match else None
+
+                    if any(pattern in line for pattern in _NAV_PATTERNS):
+                        self._nav_lines.append(i)
+                    self.line_count = i + 1
+
+        # Changes within a chunk share the same start line
+        self._section_cache: Dict[int, Tuple[str, str]] = {}
 
     def get_section_info(self, line_number: int) -> Tuple[str, str]:
         """Get section name and anchor ID from snapshot."""
-        if not self.snapshot_lines:
+        if line_number not in self._section_cache:
+            self._section_cache[line_number] = self._find_section_info(line_number)
+        return self._section_cache[line_number]
+
+    def _find_section_info(self, line_number: int) -> Tuple[str, str]:
+        """Look up section name and anchor ID in the snapshot (uncached)."""
+        if not self.line_count:
             return ("不明なセクション", "")
 
         # Check if this is a navigation element (before any heading)
         # Look for navigation-related patterns in nearby lines
-        for i in range(max(0, line_number - 10), min(line_number + 10, len(self.snapshot_lines))):
-            line = self.snapshot_lines[i]
-            if any(pattern in line for pattern in ['class="md-nav', '<nav', 'md-sidebar', 'md-header']):
-                return ("目次/ナビゲーション", "")
-
-        # Look backwards for nearest heading
-        for i in range(min(line_number - 1, len(self.snapshot_lines) - 1),
-                      max(0, line_number - 500), -1):
-            line = self.snapshot_lines[i]
-
-            # Match h2-h4 with id
-            h_match = re.search(r'<h([2-4])[^>]*id=["\']([^"\']+)["\'][^>]*>', line)
-            if h_match:
-                level = int(h_match.group(1))
-                anchor_id = h_match.group(2)
-
-                # Get heading text
-                if i + 1 < len(self.snapshot_lines):
-                    heading_text = re.sub(r'<[^>]+>', '', self.snapshot_lines[i + 1]).strip()
-                    if heading_text:
-                        return (heading_text, anchor_id)
+        nav_start = max(0, line_number - 10)
+        nav_end = min(line_number + 10, self.line_count)
+        idx = bisect.bisect_left(self._nav_lines, nav_start)
+        if idx < len(self._nav_lines) and self._nav_lines[idx] < nav_end:
+            return ("目次/ナビゲーション", "")
+
+        # Nearest heading above the line (within 500 lines)
+        upper = min(line_number - 1, self.line_count - 1)
+        lower = max(0, line_number - 500)
+        idx = bisect.bisect_right(self._heading_lines, upper) - 1
+        if idx >= 0 and self._heading_lines[idx] > lower:
+            return self._heading_info[idx]
 
         return ("不明なセクション", "")
 
@@ -158,6 +207,9 @@ class SemanticChangeDetector:
         recent_context = all_context[-5:] if len(all_context) > 5 else all_context
         in_table_row = any('<tr>' in line or '<td>' in line for line in recent_context)
 
+        # All changes in a chunk share the same section
+        section, anchor = self.get_section_info(chunk_start_line)
+
         # Analyze added lines
         if added_lines:
             added_boundaries = HTMLStructureDetector.find_element_boundaries(added_lines)
@@ -165,25 +217,20 @@ class SemanticChangeDetector:
             for start, end in added_boundaries:
                 element_lines = added_lines[start:end]
 
+                joined = ' '.join(element_lines)
+
                 # First, get natural element type
-                element_type = HTMLStructureDetector.detect_element_type(element_lines)
+                element_type = HTMLStructureDetector.detect_element_type(element_lines, joined)
 
                 # Override only if we're in a table row AND element doesn't have clear type
-                if (in_table_row and
-                    element_type == "content" and
-                    '<tr>' not in ' '.join(element_lines) and
-                    '<p>' not in ' '.join(element_lines) and
-                    '<div' not in ' '.join(element_lines)):
+                if in_table_row and element_type == "content" and not _RE_TR_P_DIV.search(joined):
                     element_type = "table_row"
 
                 # Get preview text
                 preview = self._extract_preview_text(element_lines)
 
-                # Get section info
-                section, anchor = self.get_section_info(chunk_start_line)
-
                 # Determine change type
-                change_type = self._classify_change_type(element_type, element_lines)
+                change_type = self._classify_change_type(element_type, element_lines, joined=joined)
 
                 change = Change(
                     section=section,
@@ -204,25 +251,21 @@ class SemanticChangeDetector:
             for start, end in removed_boundaries:
                 element_lines = removed_lines[start:end]
 
+                joined = ' '.join(element_lines)
+
                 # First, get natural element type
-                element_type = HTMLStructureDetector.detect_element_type(element_lines)
+                element_type = HTMLStructureDetector.detect_element_type(element_lines, joined)
 
                 # Override only if we're in a table row AND element doesn't have clear type
-                if (in_table_row and
-                    element_type == "content" and
-                    '<tr>' not in ' '.join(element_lines) and
-                    '<p>' not in ' '.join(element_lines) and
-                    '<div' not in ' '.join(element_lines)):
+                if in_table_row and element_type == "content" and not _RE_TR_P_DIV.search(joined):
                     element_type = "table_row"
 
                 # Get preview text
                 preview = self._extract_preview_text(element_lines)
 
-                # Get section info
-                section, anchor = self.get_section_info(chunk_start_line)
-
                 # Determine change type
-                change_type = self._classify_change_type(element_type, element_lines, is_deletion=True)
+                change_type = self._classify_change_type(element_type, element_lines, is_deletion=True,
+                                                         joined=joined)
 
                 change = Change(
                     section=section,
@@ -243,20 +286,13 @@ class SemanticChangeDetector:
 
     def _extract_preview_text(self, lines: List[str], max_length: int = 150) -> str:
         """Extract meaningful preview text from HTML lines."""
-        # Remove HTML tags and extract text
-        text_parts = []
-        for line in lines:
-            # Skip pure structural tags
-            if re.match(r'^\s*</?[^>]+>\s*$', line):
-                continue
-
-            # Extract text content
-            text = re.sub(r'<[^>]+>', '', line).strip()
-            if text and len(text) > 3:
-                text_parts.append(text)
+        # Skip pure structural tags, then strip tags from all lines in one pass
+        joined = '\n'.join(line for line in lines if not _RE_PURE_TAG.match(line))
+        texts = (text.strip() for text in _RE_STRIP_LINE_TAGS.sub('', joined).split('\n'))
+        text_parts = [text for text in texts if len(text) > 3]
 
         preview = ' '.join(text_parts)
-        preview = re.sub(r'\s+', ' ', preview).strip()
+        preview = _RE_WHITESPACE.sub(' ', preview).strip()
 
         if len(preview) > max_length:
             preview = preview[:max_length] + "..."
@@ -264,16 +300,22 @@ class SemanticChangeDetector:
         return preview
 
     def _classify_change_type(self, element_type: str, lines: List[str],
-                              is_deletion: bool = False) -> str:
-        """Classify the type of change with human-readable labels."""
-        combined = ' '.join(lines).lower()
+                              is_deletion: bool = False,
+                              joined: Optional[str] = None) -> str:
+        """Classify the type of change with human-readable labels.
+
+        joined may be passed as ' '.join(lines) when the caller already has it.
+        """
+        if joined is None:
+            joined = ' '.join(lines)
+        admonitions = {m.group(1) for m in _RE_ADMONITION_KIND.finditer(joined.lower())}
 
         prefix = "削除: " if is_deletion else "追加: "
 
         # Specific patterns
-        if 'admonition warning' in combined or 'class="admonition warning' in combined:
+        if 'warning' in admonitions:
             return f"{prefix}Warning"
-        elif 'admonition note' in combined:
+        elif 'note' in admonitions:
             return f"{prefix}Note"
         elif element_type == "table_row":
             return f"{prefix}テーブル行"
@@ -337,52 +379,60 @@ def parse_diff_advanced(diff_path: Path, snapshot_path: Path) -> List[Dict]:
     if not diff_path.exists():
         return []
 
-    with open(diff_path, 'r', encoding='utf-8') as f:
-        diff_content = f.read()
-
-    lines = diff_content.split('\n')
     detector = SemanticChangeDetector(snapshot_path)
     all_changes = []
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        # Find chunk headers (@@)
-        chunk_match = re.match(r'^@@ -(\d+),?\d* \+(\d+),?\d* @@', line)
-        if chunk_match:
-            old_line = int(chunk_match.group(1))
-            new_line = int(chunk_match.group(2))
-
-            # Collect all added, removed, and context lines in this chunk
-            added_lines = []
-            removed_lines = []
-            context_lines = []
-
-            i += 1
-            while i < len(lines) and not lines[i].startswith('@@'):
-                if lines[i].startswith('+') and not lines[i].startswith('+++'):
-                    added_lines.append(lines[i][1:])
-                elif lines[i].startswith('-') and not lines[i].startswith('---'):
-                    removed_lines.append(lines[i][1:])
-                elif not lines[i].startswith('\\'):  # Not a "No newline" marker
-                    # This is a context line (no prefix or space prefix)
-                    context_lines.append(lines[i].lstrip(' '))
-                i += 1
+    # Chunk being collected: (new_line, added_lines, removed_lines, context_lines)
+    chunk = None
 
-            # Split chunk into semantic changes
-            if added_lines or removed_lines:
-                chunk_changes = detector.split_chunk_into_changes(
-                    new_line, added_lines, removed_lines, context_lines
-                )
-                all_changes.extend(chunk_changes)
+    def finish_chunk() -> None:
+        """Split the collected chunk into semantic changes."""
+        new_line, added_lines, removed_lines, context_lines = chunk
+        if added_lines or removed_lines:
+            all_changes.extend(detector.split_chunk_into_changes(
+                new_line, added_lines, removed_lines, context_lines
+            ))
 
-            continue
+    # Stream the diff line by line, dispatching on the first character
+    raw = ''
+    with open(diff_path, 'r', encoding='utf-8') as f:
+        for raw in f:
+            line = raw.rstrip('\n')
+            head = line[:1]
+
+            # Skip "No newline at end of file" markers up front
+            if head == '\\':
+                continue
+
+            # Find chunk headers (@@)
+            if head == '@' and line.startswith('@@'):
+                if chunk is not None:
+                    finish_chunk()
+                chunk_match = _RE_CHUNK_HDR.match(line)
+                chunk = (int(chunk_match.group(2)), [], [], []) if chunk_match else None
+                continue
+
+            # Lines outside any chunk (file headers etc.)
+            if chunk is None:
+                continue
+
+            if head == '+' and line[:3] != '+++':
+                chunk[1].append(line[1:])
+            elif head == '-' and line[:3] != '---':
+                chunk[2].append(line[1:])
+            else:
+                # This is a context line (no prefix or space prefix)
+                chunk[3].append(line.lstrip(' '))
 
-        i += 1
+    if chunk is not None:
+        # A final newline leaves an empty last line, which is context
+        # for the last chunk (it shifts the table-row context window)
+        if raw.endswith('\n'):
+            chunk[3].append('')
+        finish_chunk()
 
     # Convert to dict format
-    return [asdict(change) for change in all_changes]
+    return [{name: getattr(change, name) for name in _CHANGE_FIELDS} for change in all_changes]
 
 
 def main():
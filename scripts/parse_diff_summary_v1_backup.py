@@ -1,10 +1,106 @@
 #!/usr/bin/env python3
 """Parse diff and generate human-readable change summary."""
 
+import bisect
+import functools
+import json
 import re
+from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_READ_BUFFER_SIZE = 1 << 20
+
+_H_ID_RE = re.compile(r'<h([1-6])[^>]*id=["\']([^"\']+)["\'][^>]*>')
+_H_SECTION_ID_RE = re.compile(r'<h([2-4])[^>]*id=["\']([^"\']+)["\'][^>]*>')
+_H_SINGLE_RE = re.compile(r'<h([1-6])[^>]*>(.*?)</h[1-6]>')
+_MD_H_RE = re.compile(r'^\+?\s*(#{1,6})\s+(.+)')
+_TAG_STRIP_RE = re.compile(r'<[^>]+>')
+_HUNK_RE = re.compile(r'^@@ -(\d+),?\d* \+(\d+),?\d* @@')
+_ID_ATTR_RE = re.compile(r'id=["\']([^"\']+)["\']')
+
+# Change-type markers and their labels, in priority order
+_CLASSIFY_RE = re.compile(
+    r'(?P<warning>warning)|(?P<note>note)|(?P<table>table|<td>)|(?P<nav>nav|menu)'
+    r'|(?P<heading><h)|(?P<list_item><li>)|(?P<paragraph><p>)'
+)
+_CLASSIFY_LABELS = (
+    ('warning', "Warning"),
+    ('note', "Note"),
+    ('table', "テーブル"),
+    ('nav', "ナビゲーション"),
+    ('heading', "見出し"),
+    ('list_item', "リスト項目"),
+    ('paragraph', "段落"),
+)
+
+
+@dataclass(slots=True)
+class Changes:
+    """Parsed changes stored as parallel per-field lists."""
+    sections: List[str] = field(default_factory=list)
+    types: List[str] = field(default_factory=list)
+    lines: List[int] = field(default_factory=list)
+    previews: List[str] = field(default_factory=list)
+    additions: List[int] = field(default_factory=list)
+    deletions: List[int] = field(default_factory=list)
+    anchors: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def append(self, section: str, change_type: str, line: int, preview: str,
+               additions: int, deletions: int, anchor: str) -> None:
+        """Add one change to every column."""
+        self.sections.append(section)
+        self.types.append(change_type)
+        self.lines.append(line)
+        self.previews.append(preview)
+        self.additions.append(additions)
+        self.deletions.append(deletions)
+        self.anchors.append(anchor)
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """Materialize the changes as one dict per change for JSON output."""
+        return [
+            {
+                'section': section,
+                'type': change_type,
+                'line': line,
+                'preview': preview,
+                'additions': additions,
+                'deletions': deletions,
+                'anchor': anchor
+            }
+            for section, change_type, line, preview, additions, deletions, anchor in zip(
+                self.sections, self.types, self.lines, self.previews,
+                self.additions, self.deletions, self.anchors
+            )
+        ]
+
+
+@functools.lru_cache(maxsize=4096)
+def _strip_tags(text: str) -> str:
+    """Strip HTML tags and surrounding whitespace from a line.
+
+    Navigation and footer template lines repeat often, so results are cached.
+
+    Args:
+        text: Line to strip
+
+    Returns:
+        Text content of the line
+    """
+    if '<' not in text:
+        return text.strip()
+    return _TAG_STRIP_RE.sub('', text).strip()
+
 
 def extract_section_context(lines: List[str], start_idx: int, max_lines: int = 200) -> str:
     """Extract surrounding context to identify the section.
@@ -17,54 +113,56 @@ def extract_section_context(lines: List[str], start_idx: int, max_lines: int = 2
     Returns:
         Section identifier (e.g., "1.2 サービスメニュー")
     """
-    # Look backwards for section headers (h1-h6)
-    # Prioritize h3-h4 (subsections), then h2, then h1
-    found_headings = []
+    # Look backwards for section headers (h1-h6), closest first.
+    # The closest h2-h4 (section/subsection level) wins; otherwise fall
+    # back to the closest heading of any level.
+    fallback = None
 
-    for i in range(max(0, start_idx - max_lines), start_idx):
+    for i in range(start_idx - 1, max(0, start_idx - max_lines) - 1, -1):
         line = lines[i]
 
         # Skip deleted lines
-        if line.startswith('-') and not line.startswith('---'):
+        if line[:1] == '-' and line[:3] != '---':
             continue
 
+        level = None
+        # Cheap substring checks rule out most lines before any regex runs
+        has_h_tag = '<h' in line
+
         # Match HTML headings with id attributes
-        h_match = re.search(r'<h([1-6])[^>]*id=["\']([^"\']+)["\'][^>]*>', line)
+        h_match = _H_ID_RE.search(line) if has_h_tag and 'id=' in line else None
         if h_match:
-            level = int(h_match.group(1))
             # Look for the next line with actual heading text
             if i + 1 < len(lines):
                 next_line = lines[i + 1]
                 # Remove leading + if present, and strip HTML tags
-                heading_text = re.sub(r'<[^>]+>', '', next_line.lstrip('+ ')).strip()
-                if heading_text and len(heading_text) > 0:
-                    found_headings.append((level, heading_text, i))
-                    continue
+                heading_text = _strip_tags(next_line.lstrip('+ '))
+                if heading_text:
+                    level = int(h_match.group(1))
 
         # Match complete heading tags on single line
-        h_match_single = re.search(r'<h[1-6][^>]*>(.*?)</h[1-6]>', line)
-        if h_match_single:
-            heading_text = re.sub(r'<[^>]+>', '', h_match_single.group(1)).strip()
-            if heading_text and len(heading_text) > 0:
-                level = int(re.search(r'<h([1-6])', line).group(1))
-                found_headings.append((level, heading_text, i))
-                continue
+        if level is None and has_h_tag and '</h' in line:
+            h_match_single = _H_SINGLE_RE.search(line)
+            if h_match_single:
+                heading_text = _strip_tags(h_match_single.group(2))
+                if heading_text:
+                    level = int(h_match_single.group(1))
 
         # Match markdown-style headings
-        md_match = re.match(r'^\+?\s*(#{1,6})\s+(.+)', line)
-        if md_match:
-            level = len(md_match.group(1))
-            heading_text = md_match.group(2).strip()
-            found_headings.append((level, heading_text, i))
-
-    # Return the most recent h2-h4 heading (closest to the change)
-    if found_headings:
-        # Prefer h2-h4 (section/subsection level)
-        section_headings = [(lvl, txt, idx) for lvl, txt, idx in found_headings if 2 <= lvl <= 4]
-        if section_headings:
-            return section_headings[-1][1]  # Return text of the closest one
-        # Fallback to any heading
-        return found_headings[-1][1]
+        if level is None and '#' in line:
+            md_match = _MD_H_RE.match(line)
+            if md_match:
+                level = len(md_match.group(1))
+                heading_text = md_match.group(2).strip()
+
+        if level is not None:
+            if 2 <= level <= 4:
+                return heading_text
+            if fallback is None:
+                fallback = heading_text
+
+    if fallback is not None:
+        return fallback
 
     return "不明なセクション"
 
@@ -79,61 +177,77 @@ def identify_change_type(added_lines: List[str], removed_lines: List[str]) -> st
     Returns:
         Description of change type
     """
-    added_text = ' '.join(added_lines).lower()
-    removed_text = ' '.join(removed_lines).lower()
-
-    # Check for specific patterns
-    if 'warning' in added_text or 'admonition warning' in added_text:
-        return "Warning"
-    elif 'note' in added_text or 'admonition note' in added_text:
-        return "Note"
-    elif 'table' in added_text or '<td>' in added_text:
-        return "テーブル"
-    elif 'nav' in added_text or 'menu' in added_text:
-        return "ナビゲーション"
-    elif '<h' in added_text:
-        return "見出し"
-    elif '<li>' in added_text:
-        return "リスト項目"
-    elif '<p>' in added_text:
-        return "段落"
-    else:
-        return "コンテンツ"
+    # Markers never contain spaces, so scanning the lines one at a time finds
+    # the same markers as scanning them joined. Stop at the top-priority one.
+    found = set()
+    for line in added_lines:
+        found.update(m.lastgroup for m in _CLASSIFY_RE.finditer(line.lower()))
+        if 'warning' in found:
+            break
+    for group, label in _CLASSIFY_LABELS:
+        if group in found:
+            return label
+    return "コンテンツ"
+
+
+def build_section_index(snapshot_path: Path) -> List[Tuple[int, str, str]]:
+    """Index the h2-h4 headings with id attributes in a snapshot HTML file.
+
+    Args:
+        snapshot_path: Path to the snapshot HTML file
 
+    Returns:
+        List of (line_index, heading_text, anchor_id) sorted by line index
+    """
+    if not snapshot_path.exists():
+        return []
 
-def get_section_from_snapshot(snapshot_path: Path, line_number: int) -> Tuple[str, str]:
-    """Get section name and anchor ID from snapshot HTML file.
+    index = []
+    pending_anchor = None
+    with open(snapshot_path, 'r', encoding='utf-8', buffering=_READ_BUFFER_SIZE) as f:
+        for i, line in enumerate(f):
+            # Heading text sits on the line after the opening tag
+            if pending_anchor is not None:
+                heading_text = _strip_tags(line)
+                if heading_text:
+                    index.append((i - 1, heading_text, pending_anchor))
+
+            h_match = _H_SECTION_ID_RE.search(line) if '<h' in line and 'id=' in line else None
+            pending_anchor = h_match.group(2) if h_match else None
+
+    return index
+
+
+def find_section(section_index: List[Tuple[int, str, str]], line_number: int) -> Tuple[str, str]:
+    """Find the nearest heading at or before a snapshot line.
 
     Args:
-        snapshot_path: Path to the snapshot HTML file
+        section_index: Index built by build_section_index
         line_number: Line number in the snapshot
 
     Returns:
         Tuple of (section_name, anchor_id)
     """
-    if not snapshot_path.exists():
-        return ("不明なセクション", "")
+    # Only headings within the 500 lines above the change count
+    k = bisect.bisect_right(section_index, line_number - 1, key=itemgetter(0)) - 1
+    if k >= 0 and section_index[k][0] > max(0, line_number - 500):
+        _, heading_text, anchor_id = section_index[k]
+        return (heading_text, anchor_id)
 
-    with open(snapshot_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    return ("不明なセクション", "")
 
-    # Look backwards from the line to find the nearest heading with id
-    for i in range(min(line_number - 1, len(lines) - 1), max(0, line_number - 500), -1):
-        line = lines[i]
 
-        # Match heading tags with id attribute
-        h_match = re.search(r'<h([2-4])[^>]*id=["\']([^"\']+)["\'][^>]*>', line)
-        if h_match:
-            level = int(h_match.group(1))
-            anchor_id = h_match.group(2)
+def get_section_from_snapshot(snapshot_path: Path, line_number: int) -> Tuple[str, str]:
+    """Get section name and anchor ID from snapshot HTML file.
 
-            # Get heading text from next line
-            if i + 1 < len(lines):
-                heading_text = re.sub(r'<[^>]+>', '', lines[i + 1]).strip()
-                if heading_text:
-                    return (heading_text, anchor_id)
+    Args:
+        snapshot_path: Path to the snapshot HTML file
+        line_number: Line number in the snapshot
 
-    return ("不明なセクション", "")
+    Returns:
+        Tuple of (section_name, anchor_id)
+    """
+    return find_section(build_section_index(snapshot_path), line_number)
 
 
 def extract_anchor_id(lines: List[str], chunk_start: int, max_lines: int = 100) -> str:
@@ -151,109 +265,93 @@ def extract_anchor_id(lines: List[str], chunk_start: int, max_lines: int = 100)
         line = lines[i]
 
         # Skip deleted lines
-        if line.startswith('-') and not line.startswith('---'):
+        if line[:1] == '-' and line[:3] != '---':
             continue
 
         # Match id attributes in any tag
-        id_match = re.search(r'id=["\']([^"\']+)["\']', line)
+        id_match = _ID_ATTR_RE.search(line) if 'id=' in line else None
         if id_match:
             return id_match.group(1)
 
     return ""
 
 
-def parse_diff_summary(diff_path: Path) -> List[Dict[str, str]]:
+def parse_diff_summary(diff_path: Path) -> Changes:
     """Parse diff file and extract change summary.
 
     Args:
         diff_path: Path to diff file
 
     Returns:
-        List of change descriptions with line numbers
+        Change descriptions with line numbers
     """
     if not diff_path.exists():
-        return []
-
-    with open(diff_path, 'r', encoding='utf-8') as f:
-        diff_content = f.read()
+        return Changes()
 
-    lines = diff_content.split('\n')
-    changes = []
+    # Build the line list straight from the buffered file instead of
+    # holding the whole text and its split copy at the same time
+    with open(diff_path, 'r', encoding='utf-8', buffering=_READ_BUFFER_SIZE) as f:
+        lines = [line.rstrip('\n') for line in f]
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    changes = Changes()
 
-        # Find chunk headers (@@)
-        chunk_match = re.match(r'^@@ -(\d+),?\d* \+(\d+),?\d* @@', line)
-        if chunk_match:
-            old_line = int(chunk_match.group(1))
-            new_line = int(chunk_match.group(2))
-
-            # Collect changes in this chunk
-            added_lines = []
-            removed_lines = []
-            chunk_start = i
-
-            i += 1
-            while i < len(lines) and not lines[i].startswith('@@'):
-                if lines[i].startswith('+') and not lines[i].startswith('+++'):
-                    added_lines.append(lines[i][1:])
-                elif lines[i].startswith('-') and not lines[i].startswith('---'):
-                    removed_lines.append(lines[i][1:])
-                i += 1
-
-            # Only process if there are actual changes
-            if added_lines or removed_lines:
-                section = extract_section_context(lines, chunk_start)
-                change_type = identify_change_type(added_lines, removed_lines)
-                anchor_id = extract_anchor_id(lines, chunk_start)
-
-                # Extract meaningful preview text
-                preview_text = ""
-                if added_lines:
-                    # Get first meaningful line
-                    for line in added_lines:
-                        text = re.sub(r'<[^>]+>', '', line).strip()
-                        if text and len(text) > 5:
-                            preview_text = text[:100] + ("..." if len(text) > 100 else "")
-                            break
-
-                change_desc = {
-                    'section': section,
-                    'type': change_type,
-                    'line': new_line,
-                    'preview': preview_text,
-                    'additions': len(added_lines),
-                    'deletions': len(removed_lines),
-                    'anchor': anchor_id
-                }
-
-                changes.append(change_desc)
+    # Every '@@' line ends the previous chunk; index them once and treat the
+    # lines between consecutive headers as chunk bodies
+    header_indices = [i for i, ln in enumerate(lines) if ln[:2] == '@@']
+    header_indices.append(len(lines))
+    hunk_match = _HUNK_RE.match
 
+    for chunk_start, chunk_end in zip(header_indices, header_indices[1:]):
+        chunk_match = hunk_match(lines[chunk_start])
+        if not chunk_match:
             continue
 
-        i += 1
+        new_line = int(chunk_match.group(2))
+
+        # Collect changes in this chunk; +++/--- are file headers
+        body = lines[chunk_start + 1:chunk_end]
+        added_lines = [ln[1:] for ln in body if ln[:1] == '+' and ln[:3] != '+++']
+        removed_lines = [ln[1:] for ln in body if ln[:1] == '-' and ln[:3] != '---']
+
+        # Only process if there are actual changes
+        if added_lines or removed_lines:
+            section = extract_section_context(lines, chunk_start)
+            change_type = identify_change_type(added_lines, removed_lines)
+            anchor_id = extract_anchor_id(lines, chunk_start)
+
+            # Extract meaningful preview text from the first meaningful line
+            preview_text = ""
+            for line in added_lines:
+                # Plain-text lines need no tag stripping or cache lookup
+                text = _strip_tags(line) if '<' in line else line.strip()
+                if len(text) > 5:
+                    preview_text = text[:100] + ("..." if len(text) > 100 else "")
+                    break
+
+            changes.append(section, change_type, new_line, preview_text,
+                           len(added_lines), len(removed_lines), anchor_id)
 
     return changes
 
 
-def generate_summary_json(changes: List[Dict[str, str]], output_path: Path) -> None:
+def generate_summary_json(changes: Changes, output_path: Path) -> None:
     """Generate JSON summary file.
 
     Args:
-        changes: List of change descriptions
+        changes: Change descriptions
         output_path: Path to output JSON file
     """
-    import json
-
     summary = {
         'total_changes': len(changes),
-        'changes': changes
+        'changes': changes.to_dicts()
     }
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    # orjson writes the same indented UTF-8 output much faster; fall back if not installed
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
 
     print(f"✅ Generated summary: {output_path}")
 
@@ -276,15 +374,16 @@ def main():
         latest_snapshot = snapshot_files[-1]
         print(f"📄 Reading section info from {latest_snapshot.name}")
 
-        for change in changes:
-            section_name, anchor_id = get_section_from_snapshot(latest_snapshot, change['line'])
+        section_index = build_section_index(latest_snapshot)
+        for k, line_number in enumerate(changes.lines):
+            section_name, anchor_id = find_section(section_index, line_number)
             if section_name != "不明なセクション":
-                change['section'] = section_name
+                changes.sections[k] = section_name
             if anchor_id:
-                change['anchor'] = anchor_id
+                changes.anchors[k] = anchor_id
 
     print(f"📊 Found {len(changes)} change(s):")
-    for i, change in enumerate(changes, 1):
+    for i, change in enumerate(changes.to_dicts(), 1):
         print(f"\n{i}. {change['section']} > {change['type']}")
         print(f"   Line: {change['line']}")
         print(f"   Changes: +{change['additions']} -{change['deletions']}")